@@ -34,11 +34,10 @@ install_requires = [
     'future',
     'requests',
     'tldextract',
-    'validators',
     'dnspython'
 ]
 
-tests_require = ['nose-parameterized']
+tests_require = ['nose-parameterized', 'validators']
 
 version = sys.version_info
 
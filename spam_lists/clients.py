@@ -11,6 +11,10 @@ is required.
 """
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+from threading import Lock
+
 # pylint: disable=redefined-builtin
 from builtins import zip, str, range, object
 from dns import name
@@ -19,7 +23,10 @@ from six import raise_from
 from requests import get, post
 from requests.exceptions import HTTPError
 
-from .exceptions import UnathorizedAPIKeyError, UnknownCodeError
+from .compat import lru_cache, monotonic
+from .exceptions import (
+    InvalidHostError, UnathorizedAPIKeyError, UnknownCodeError
+)
 from .host_list import HostList
 from .structures import (
     AddressListItem, non_ipv6_host, ip_address, registered_domain,
@@ -29,8 +36,83 @@ from .structures import (
 from .validation import accepts_valid_urls
 
 
+class QueryResultCache(object):
+    """A cache of results of queries to online services.
+
+    The results are stored for a limited time, so that changes in
+    the services are noticed. If the cache is full, the least recently
+    used results are discarded first.
+
+    Instances of this class can be shared by multiple threads.
+    """
+
+    def __init__(self, maxsize, ttl):
+        """Initialize a new instance.
+
+        :param maxsize: the maximum number of results to be stored
+        :param ttl: a number of seconds after which a result expires
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._results = OrderedDict()
+        self._lock = Lock()
+
+    def get_result(self, key, query_function):
+        """Get a cached or a new result of a query.
+
+        The query function is called without holding a lock, so that
+        different queries can be performed concurrently.
+
+        :param key: a hashable value identifying the query
+        :param query_function: a function performing the query if its
+        result is not cached, called without arguments
+        :returns: the result of the query
+        """
+        now = monotonic()
+        with self._lock:
+            entry = self._results.pop(key, None)
+            if entry is not None and entry[0] > now:
+                self._results[key] = entry
+                return entry[1]
+        result = query_function()
+        with self._lock:
+            self._results[key] = now + self._ttl, result
+            while len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def __contains__(self, key):
+        """Check if an unexpired result of a query is cached.
+
+        The check does not affect the order in which results are
+        discarded.
+
+        :param key: a hashable value identifying the query
+        :returns: True if the result is cached
+        """
+        with self._lock:
+            entry = self._results.get(key)
+        return entry is not None and entry[0] > monotonic()
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock:
+            self._results.clear()
+
+
 class DNSBL(HostList):
-    """Represents a DNSBL service client."""
+    """Represents a DNSBL service client.
+
+    :cvar max_concurrent_queries: the maximum number of DNS queries
+    performed at the same time while testing multiple URLs
+    :cvar cache_size: the maximum number of cached query results
+    :cvar cache_ttl: a number of seconds for which a query result
+    is cached
+    """
+
+    max_concurrent_queries = 16
+    cache_size = 4096
+    cache_ttl = 300
 
     def __init__(
             self,
@@ -48,13 +130,46 @@ class DNSBL(HostList):
         DNSBL query return codes
         :param host_factory: a callable object that returns an object
         representing host and providing method for getting a relative
-        domain pertaining to it.
+        domain pertaining to it. Its return values are cached, because
+        testing multiple URLs requires them twice for each host.
         """
         self._identifier = identifier
         self._query_suffix = name.from_text(query_suffix)
         self._classification_map = classification_map
-        self._host_factory = host_factory
-        super(DNSBL, self).__init__(host_factory)
+        self._cache = QueryResultCache(self.cache_size, self.cache_ttl)
+        super(DNSBL, self).__init__(
+            lru_cache(maxsize=self.cache_size)(host_factory)
+        )
+
+    def cache_clear(self):
+        """Remove all cached query results."""
+        self._cache.clear()
+
+    def _get_query_name(self, host_object):
+        """Get a domain name to be queried for given value.
+
+        :param host_object: an object representing host, created by
+        self._host_factory
+        :returns: the domain name
+        """
+        host_to_query = host_object.relative_domain
+        return host_to_query.derelativize(self._query_suffix)
+
+    def _query_name(self, query_name):
+        """Query the DNSBL service for given domain name.
+
+        The results are cached for cache_ttl seconds.
+
+        :param query_name: a domain name to be queried
+        :returns: an instance of dns.resolver.Answer for given name if
+        it is listed. Otherwise, it returns None.
+        """
+        def query_service():
+            try:
+                return query(query_name)
+            except NXDOMAIN:
+                return None
+        return self._cache.get_result(query_name, query_service)
 
     def _query(self, host_object):
         """Query the DNSBL service for given value.
@@ -64,17 +179,71 @@ class DNSBL(HostList):
         :returns: an instance of dns.resolver.Answer for given value if
         it is listed. Otherwise, it returns None.
         """
-        host_to_query = host_object.relative_domain
-        query_name = host_to_query.derelativize(self._query_suffix)
-        try:
-            return query(query_name)
-        except NXDOMAIN:
-            return None
+        return self._query_name(self._get_query_name(host_object))
+
+    def _get_uncached_query_names(self, host_values):
+        """Get domain names to be queried for the values.
+
+        :param host_values: a sequence of valid host values
+        :returns: a list of unique domain names whose query results
+        are not cached, in the order of the values
+        """
+        query_names = OrderedDict()
+        for host_value in host_values:
+            try:
+                host_object = self._host_factory(host_value)
+            except InvalidHostError:
+                continue
+            query_name = self._get_query_name(host_object)
+            if query_name not in self._cache and query_name not in query_names:
+                query_names[query_name] = None
+        return list(query_names)
 
     def __str__(self):
         """Convert the client to a string."""
         return str(self._identifier)
 
+    def _prefetch(self, query_name):
+        """Query the DNSBL service to cache the result for the name.
+
+        Errors are ignored, since failed queries are not cached and
+        are repeated when their results are needed.
+
+        :param query_name: a domain name to be queried
+        """
+        try:
+            self._query_name(query_name)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    def _map(self, function, host_values):
+        """Call the function for each of the given host values.
+
+        The values are processed in batches of max_concurrent_queries.
+        If results of queries for more than one of the values in
+        a batch are not cached, the queries are first run concurrently,
+        so that their round-trip times overlap. The function is then
+        called for the values in turn, using the cached results.
+        No queries are run for the batches following the one in which
+        the iteration stops.
+
+        :param function: a function accepting a valid host value
+        :param host_values: a sequence of valid host values
+        :returns: a generator yielding return values of the function,
+        in the same order as the host values
+        """
+        batch_size = self.max_concurrent_queries
+        for start in range(0, len(host_values), batch_size):
+            batch = host_values[start:start + batch_size]
+            query_names = self._get_uncached_query_names(batch)
+            if len(query_names) > 1:
+                workers = len(query_names)
+                for _ in map_concurrently(self._prefetch, query_names,
+                                          workers):
+                    pass
+            for host_value in batch:
+                yield function(host_value)
+
     def _contains(self, host_object):
         return bool(self._query(host_object))
 
@@ -98,6 +267,23 @@ class DNSBL(HostList):
             raise_from(UnknownCodeError(msg), ex)
 
 
+def map_concurrently(function, values, workers):
+    """Call the function for the values using a pool of threads.
+
+    :param function: a function to be called
+    :param values: a sequence of arguments for the function
+    :param workers: a number of threads to be used
+    :returns: a generator yielding return values of the function,
+    in the same order as the values
+    """
+    pool = ThreadPool(workers)
+    try:
+        for result in pool.imap(function, values):
+            yield result
+    finally:
+        pool.terminate()
+
+
 def get_powers_of_2(_sum):
     """Get powers of 2 that sum up to the given number.
 
@@ -130,10 +316,17 @@ class BitmaskingDNSBL(DNSBL):
 
 
 class HpHosts(HostList):
-    """A class of clients of hpHosts service."""
+    """A class of clients of hpHosts service.
+
+    :cvar cache_size: the maximum number of cached query results
+    :cvar cache_ttl: a number of seconds for which a query result
+    is cached
+    """
 
     identifier = ' http://www.hosts-file.net/'
     _NOT_LISTED = 'Not Listed'
+    cache_size = 4096
+    cache_ttl = 300
 
     def __init__(self, client_name):
         """Initialize a new instance.
@@ -141,11 +334,18 @@ class HpHosts(HostList):
         :param client_name: name of client using the service
         """
         self.app_id = client_name
+        self._cache = QueryResultCache(self.cache_size, self.cache_ttl)
         super(HpHosts, self).__init__(non_ipv6_host)
 
+    def cache_clear(self):
+        """Remove all cached query results."""
+        self._cache.clear()
+
     def _query(self, host_object, classification=False):
         """Query the client for data of given host.
 
+        The results are cached for cache_ttl seconds.
+
         :param host_object: an object representing a host value
         :param classification: if True: hpHosts is queried also
         for classification for given host, if listed
@@ -155,7 +355,7 @@ class HpHosts(HostList):
         template = 'http://verify.hosts-file.net/?v={}&s={}'
         url = template.format(self.app_id, host_object.to_unicode())
         url = url + '&class=true' if classification else url
-        return get(url).text
+        return self._cache.get_result(url, lambda: get(url).text)
 
     def _contains(self, host_object):
         return self._NOT_LISTED not in self._query(host_object)
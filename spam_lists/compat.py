@@ -13,3 +13,8 @@ try:
     from functools import lru_cache  # @NoMove
 except ImportError:
     from cachetools.func import lru_cache  # @NoMove @UnusedImport
+
+try:
+    from time import monotonic  # @NoMove
+except ImportError:
+    from time import time as monotonic  # @NoMove @UnusedImport
@@ -4,8 +4,7 @@
 from __future__ import unicode_literals
 
 # pylint: disable=redefined-builtin
-from builtins import object
-from future.moves.urllib.parse import urlparse
+from builtins import map, object, zip
 
 from .exceptions import InvalidHostError
 from .structures import AddressListItem
@@ -47,14 +46,15 @@ class HostList(object):
         """
         raise NotImplementedError
 
-    @accepts_valid_host
-    def __contains__(self, host_value):
-        """Check if the given host value is listed by the host list.
+    def _is_listed(self, host_value):
+        """Check if the host list contains a match for a valid host.
+
+        Contrary to __contains__, this method does not validate
+        the argument. It is used by methods receiving URLs whose hosts
+        are already validated with them.
 
         :param host_value: a string representing a valid host
         :returns: True if the host is listed
-        :raises InvalidHostError: if the argument is not a valid
-        host string
         """
         try:
             host_object = self._host_factory(host_value)
@@ -62,16 +62,15 @@ class HostList(object):
             return False
         return self._contains(host_object)
 
-    @accepts_valid_host
-    def lookup(self, host_value):
-        """Get a host value matching the given value.
+    def _lookup(self, host_value):
+        """Get an item matching a valid host.
 
-        :param host_value: a value of the host of a type that can be
-        listed by the service
+        Contrary to lookup, this method does not validate
+        the argument.
+
+        :param host_value: a string representing a valid host
         :returns: an instance of AddressListItem representing
-        a matched value
-        :raises InvalidHostError: if the argument is not a valid
-        host string
+        a matched value, or None if the host is not listed
         """
         try:
             host_object = self._host_factory(host_value)
@@ -89,6 +88,44 @@ class HostList(object):
             )
         return None
 
+    def _map(self, function, host_values):
+        """Call the function for each of the given host values.
+
+        Subclasses may override this method to process the values
+        concurrently.
+
+        :param function: a function accepting a valid host value
+        :param host_values: a sequence of valid host values
+        :returns: an iterator yielding return values of the function,
+        in the same order as the host values
+        """
+        # pylint: disable=no-self-use
+        return map(function, host_values)
+
+    @accepts_valid_host
+    def __contains__(self, host_value):
+        """Check if the given host value is listed by the host list.
+
+        :param host_value: a string representing a valid host
+        :returns: True if the host is listed
+        :raises InvalidHostError: if the argument is not a valid
+        host string
+        """
+        return self._is_listed(host_value)
+
+    @accepts_valid_host
+    def lookup(self, host_value):
+        """Get a host value matching the given value.
+
+        :param host_value: a value of the host of a type that can be
+        listed by the service
+        :returns: an instance of AddressListItem representing
+        a matched value
+        :raises InvalidHostError: if the argument is not a valid
+        host string
+        """
+        return self._lookup(host_value)
+
     @accepts_valid_urls
     def any_match(self, urls):
         """Check if any of the given URLs has a matching host.
@@ -98,7 +135,7 @@ class HostList(object):
         :raises InvalidURLError: if there are any invalid URLs in
         the sequence
         """
-        return any(urlparse(u).hostname in self for u in urls)
+        return any(self._map(self._is_listed, urls.hosts))
 
     @accepts_valid_urls
     def lookup_matching(self, urls):
@@ -110,9 +147,7 @@ class HostList(object):
         :raises InvalidURLError: if there are any invalid URLs in
         the sequence
         """
-        hosts = (urlparse(u).hostname for u in urls)
-        for val in hosts:
-            item = self.lookup(val)
+        for item in self._map(self._lookup, urls.hosts):
             if item is not None:
                 yield item
 
@@ -125,6 +160,7 @@ class HostList(object):
         :raises InvalidURLError: if there are any invalid URLs in
         the sequence
         """
-        for url in urls:
-            if urlparse(url).hostname in self:
+        listed = self._map(self._is_listed, urls.hosts)
+        for url, is_listed in zip(urls, listed):
+            if is_listed:
                 yield url
@@ -14,17 +14,19 @@ from dns.reversename import (
 )
 from future.utils import raise_with_traceback
 import tldextract
-import validators
 
 from .exceptions import (
     InvalidHostError, InvalidHostnameError, InvalidIPv4Error, InvalidIPv6Error
 )
 from .compat import lru_cache
+from .validation import DOMAIN_REGEX
 
 
 class Host(object):
     """A base class for host objects."""
 
+    __slots__ = ()
+
     def __lt__(self, other):
         """Check if self is less than the other.
 
@@ -66,6 +68,8 @@ class Hostname(Host):
     objects.
     """
 
+    __slots__ = ('value', 'relative_domain')
+
     def __init__(self, value):
         """Initialize a new instance.
 
@@ -74,7 +78,7 @@ class Hostname(Host):
         a valid domain
         """
         value = str(value)
-        if not validators.domain(value):
+        if not DOMAIN_REGEX.match(value):
             msg = "'{}' is not a valid hostname".format(value)
             raise_with_traceback(InvalidHostnameError(msg))
         hostname = name.Name(value.split('.'))
@@ -111,6 +115,7 @@ class IPAddress(Host):
     objects.
     """
 
+    __slots__ = ('value',)
     reverse_domain = None
 
     def __init__(self, value):
@@ -164,6 +169,7 @@ class IPAddress(Host):
 class IPv4Address(IPAddress):
     """A class of objects representing IPv4 addresses."""
 
+    __slots__ = ()
     factory = ipaddress.IPv4Address
     reverse_domain = ipv4_reverse_domain
     invalid_ip_error_type = InvalidIPv4Error
@@ -172,6 +178,7 @@ class IPv4Address(IPAddress):
 class IPv6Address(IPAddress):
     """A class of objects representing IPv6 addresses."""
 
+    __slots__ = ()
     factory = ipaddress.IPv6Address
     reverse_domain = ipv6_reverse_domain
     invalid_ip_error_type = InvalidIPv6Error
@@ -4,30 +4,85 @@
 from __future__ import unicode_literals
 
 import functools
+from inspect import CO_VARARGS, CO_VARKEYWORDS
 import re
 
-from future.moves.urllib.parse import urlparse
-import validators
-
+from .compat import lru_cache
 from .exceptions import InvalidURLError, InvalidHostError
 
 
+_IPV4_OCTET = r'(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])'
+_IPV4 = r'(?:{0}\.){{3}}{0}'.format(_IPV4_OCTET)
+_H16 = r'[0-9a-f]{1,4}'
+
+IPV4_REGEX = re.compile(r'^{}\Z'.format(_IPV4))
+
+# The alternatives follow the IPv6address rule of RFC 3986: the last
+# 32 bits may be written as an IPv4 address, and "::" may replace one
+# or more groups of zeros anywhere in the address.
+_LS32 = r'(?:{h}:{h}|{ipv4})'.format(h=_H16, ipv4=_IPV4)
+
+IPV6_REGEX = re.compile(r'^(?:'
+                        r'(?:{h}:){{6}}{ls32}|'
+                        r'::(?:{h}:){{5}}{ls32}|'
+                        r'(?:{h})?::(?:{h}:){{4}}{ls32}|'
+                        r'(?:(?:{h}:){{0,1}}{h})?::(?:{h}:){{3}}{ls32}|'
+                        r'(?:(?:{h}:){{0,2}}{h})?::(?:{h}:){{2}}{ls32}|'
+                        r'(?:(?:{h}:){{0,3}}{h})?::{h}:{ls32}|'
+                        r'(?:(?:{h}:){{0,4}}{h})?::{ls32}|'
+                        r'(?:(?:{h}:){{0,5}}{h})?::{h}|'
+                        r'(?:(?:{h}:){{0,6}}{h})?::'
+                        r')\Z'.format(h=_H16, ls32=_LS32), re.IGNORECASE)
+
+DOMAIN_REGEX = re.compile(r'^(?=.{1,253}\Z)'  # maximum length
+                          r'(?:[a-z0-9](?:[a-z0-9\-_]{0,61}[a-z0-9])?\.)+'
+                          r'[a-z0-9][a-z0-9\-]{0,61}[a-z]\Z',  # TLD
+                          re.IGNORECASE)
+
+
+@lru_cache(maxsize=8192)
 def is_valid_host(value):
     """Check if given value is a valid host string.
 
     :param value: a value to test
     :returns: True if the value is valid
     """
-    host_validators = validators.ipv4, validators.ipv6, validators.domain
-    return any(f(value) for f in host_validators)
-
-
-URL_REGEX = re.compile(r'^[a-z0-9\.\-\+]*://'  # scheme
-                       r'(?:\S+(?::\S*)?@)?'  # authentication
-                       r'(?:[^/:]+|\[[0-9a-f:\.]+\])'  # host
+    return bool(
+        DOMAIN_REGEX.match(value) or
+        IPV4_REGEX.match(value) or
+        IPV6_REGEX.match(value)
+    )
+
+
+# The pattern is case-sensitive: it is matched against lowercase
+# values. IPv6 addresses are captured without surrounding brackets.
+URL_REGEX = re.compile(r'^[a-z][a-z0-9\.\-\+]*://'  # scheme
+                       r'(?:[^\s/?#]+@)?'  # authentication
+                       r'(?:(?P<host>[^\s/:?#@\[\]]+)|'  # host
+                       r'\[(?P<ipv6_host>[0-9a-f:\.]+)\])'
                        r'(?::\d{2,5})?'  # port
                        r'(?:[/?#][^\s]*)?'  # path, query or fragment
-                       r'$', re.IGNORECASE)
+                       r'\Z')
+
+
+@lru_cache(maxsize=8192)
+def _get_valid_host(url):
+    """Get a host part of given URL, if the URL is valid.
+
+    :param url: a URL string
+    :returns: a lowercase host string extracted from the URL, without
+    brackets surrounding IPv6 addresses, or None if the URL is not valid
+    """
+    url_lc = url.lower()
+    if '://' not in url_lc:
+        return None
+    match = URL_REGEX.match(url_lc)
+    if match is None:
+        return None
+    host = match.group('host') or match.group('ipv6_host')
+    if not is_valid_host(host):
+        return None
+    return host
 
 
 def is_valid_url(value):
@@ -36,51 +91,153 @@ def is_valid_url(value):
     :param value: a value to test
     :returns: True if the value is valid
     """
-    match = URL_REGEX.match(value)
-    host_str = urlparse(value).hostname
-    return match and is_valid_host(host_str)
+    return _get_valid_host(value) is not None
 
 
-def accepts_valid_host(func):
-    """Return a wrapper that runs given method only for valid hosts.
+def get_hostname(url):
+    """Get a host part of given URL.
+
+    This function is a lightweight replacement for accessing
+    the hostname attribute of a result of urlparse. It uses the same
+    parsing as is_valid_url.
+
+    :param url: a URL string
+    :returns: a lowercase host string extracted from the URL, without
+    brackets surrounding IPv6 addresses
+    :raises InvalidURLError: if the URL is not valid
+    """
+    host = _get_valid_host(url)
+    if host is None:
+        raise InvalidURLError('The value {} is not a valid URL'.format(url))
+    return host
+
+
+def takes_only_object_and_value(func):
+    """Check if given function accepts exactly two positional arguments.
+
+    The decorators defined in this module use the result to decide
+    if they can return a wrapper without packing and unpacking
+    additional positional and keyword arguments on every call.
+
+    :param func: a function to test
+    :returns: True if the function can only be called with two
+    positional arguments
+    """
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return False
+    return (
+        code.co_argcount == 2 and
+        not code.co_flags & (CO_VARARGS | CO_VARKEYWORDS) and
+        not getattr(code, 'co_kwonlyargcount', 0)
+    )
+
+
+def _validating_wrapper(func, validate):
+    """Return a wrapper that runs given method for a validated value.
+
+    The wrapper accepts additional arguments only if the method does.
 
     :param func: a method to be wrapped
+    :param validate: a function returning a value to be passed to
+    the method or raising an error for an invalid argument
     :returns: a wrapper that adds argument validation
     """
+    if takes_only_object_and_value(func):
+        @functools.wraps(func)
+        def value_wrapper(obj, value):
+            """Run the function for the validated value."""
+            return func(obj, validate(value))
+        return value_wrapper
+
     @functools.wraps(func)
     def wrapper(obj, value, *args, **kwargs):
-        """Run the function and return a value for a valid host.
+        """Run the function for the validated value."""
+        return func(obj, validate(value), *args, **kwargs)
+    return wrapper
+
 
-        :param obj: an object in whose class the func is defined
-        :param value: a value expected to be a valid host string
-        :returns: a return value of the function func
-        :raises InvalidHostError: if the value is not valid
+def _validate_host(value):
+    """Get the value if it is a valid host.
+
+    :param value: a value expected to be a valid host string
+    :returns: the value
+    :raises InvalidHostError: if the value is not valid
+    """
+    if not is_valid_host(value):
+        raise InvalidHostError
+    return value
+
+
+def accepts_valid_host(func):
+    """Return a wrapper that runs given method only for valid hosts.
+
+    :param func: a method to be wrapped
+    :returns: a wrapper that adds argument validation
+    """
+    return _validating_wrapper(func, _validate_host)
+
+
+class ValidatedURLs(tuple):
+    """A tuple of valid URLs, providing hosts extracted from them.
+
+    Instances of this class are passed to methods decorated with
+    accepts_valid_urls, so that the methods don't have to parse
+    the URLs again.
+
+    :ivar hosts: a tuple containing hosts of the URLs, in the same order
+    """
+
+    def __new__(cls, urls, hosts):
+        """Create a new instance.
+
+        :param urls: a sequence of valid URLs
+        :param hosts: a sequence of hosts of the URLs
         """
-        if not is_valid_host(value):
-            raise InvalidHostError
-        return func(obj, value, *args, **kwargs)
-    return wrapper
+        instance = super(ValidatedURLs, cls).__new__(cls, urls)
+        instance.hosts = tuple(hosts)
+        return instance
+
+
+MAX_REPORTED_INVALID_URLS = 10
+
+
+def validate_urls(urls):
+    """Get the given URLs if they are all valid.
+
+    :param urls: an iterable containing URLs
+    :returns: an instance of ValidatedURLs containing the URLs
+    :raises InvalidURLError: if the iterable contains invalid URLs.
+    The message lists up to MAX_REPORTED_INVALID_URLS of them.
+    """
+    urls = tuple(urls)
+    hosts = []
+    invalid_urls = []
+    for url in urls:
+        host = _get_valid_host(url)
+        if host is None:
+            invalid_urls.append(url)
+            if len(invalid_urls) == MAX_REPORTED_INVALID_URLS:
+                break
+        else:
+            hosts.append(host)
+    if invalid_urls:
+        msg_tpl = 'The values: {} are not valid URLs'
+        msg = msg_tpl.format(','.join(invalid_urls))
+        raise InvalidURLError(msg)
+    return ValidatedURLs(urls, hosts)
 
 
 def accepts_valid_urls(func):
     """Return a wrapper that runs given method only for valid URLs.
 
+    The URLs are collected in an instance of ValidatedURLs passed to
+    the method, so that it can be given any iterable, including one-off
+    iterators.
+    Validation stops after MAX_REPORTED_INVALID_URLS invalid values
+    are found.
+
     :param func: a method to be wrapped
     :returns: a wrapper that adds argument validation
     """
-    @functools.wraps(func)
-    def wrapper(obj, urls, *args, **kwargs):
-        """Run the function and return a value for valid URLs.
-
-        :param obj: an object in whose class f is defined
-        :param urls: an iterable containing URLs
-        :returns: a return value of the function f
-        :raises InvalidURLError: if the iterable contains invalid URLs
-        """
-        invalid_urls = [u for u in urls if not is_valid_url(u)]
-        if invalid_urls:
-            msg_tpl = 'The values: {} are not valid URLs'
-            msg = msg_tpl.format(','.join(invalid_urls))
-            raise InvalidURLError(msg)
-        return func(obj, urls, *args, **kwargs)
-    return wrapper
+    return _validating_wrapper(func, validate_urls)
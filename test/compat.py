@@ -5,13 +5,18 @@
 
 from __future__ import unicode_literals
 
+from contextlib import contextmanager
 import unittest
 
 try:
-    from unittest.mock import Mock, MagicMock, patch  # @NoMove
+    from unittest.mock import (  # @NoMove
+        Mock, MagicMock, NonCallableMock, patch
+    )
 except ImportError:
     # pylint: disable=import-error
-    from mock import Mock, MagicMock, patch  # @NoMove @UnusedImport
+    from mock import (  # @NoMove @UnusedImport
+        Mock, MagicMock, NonCallableMock, patch
+    )
 
 from six import assertCountEqual, PY2
 
@@ -31,6 +36,20 @@ class Py2TestCase(unittest.TestCase):
         """
         return assertCountEqual(self, expected_sequence, actual_sequence, msg)
 
+    @contextmanager
+    def subTest(self, msg=None, **params):
+        """Run a part of a test as a subtest.
+
+        Python 2 version of unittest does not support subtests, so
+        this implementation does nothing and a failed subtest ends
+        the whole test.
+
+        :param msg: a message describing the subtest
+        :param **params: parameters of the subtest
+        """
+        # pylint: disable=unused-argument
+        yield
+
 
 if PY2:
     unittest.TestCase = Py2TestCase
@@ -6,18 +6,18 @@ require changes in the implementation of their clients.
 """
 from __future__ import unicode_literals
 
+from functools import partial
 import os.path
 
 from builtins import object  # pylint: disable=redefined-builtin
-import tldextract
 from validators import ipv6
 
 from spam_lists.clients import (
     SPAMHAUS_ZEN, SPAMHAUS_ZEN_CLASSIFICATION, SPAMHAUS_DBL,
     SPAMHAUS_DBL_CLASSIFICATION, SURBL_MULTI, SURBL_MULTI_CLASSIFICATION
 )
-from spam_lists.clients import HpHosts, GoogleSafeBrowsing
-from spam_lists.structures import AddressListItem
+from spam_lists.clients import HpHosts, GoogleSafeBrowsing, map_concurrently
+from spam_lists.structures import AddressListItem, TLD_EXTRACTOR
 from test.compat import unittest
 
 
@@ -28,8 +28,8 @@ def ip_or_registered_domain(host):
     :returns: the host value if it is an IP address or a registered
     domain extracted from it if it is a hostname.
     """
-    registered_domain = tldextract.extract(host).registered_domain
-    return host if not registered_domain else registered_domain
+    registered_domain = TLD_EXTRACTOR(host).registered_domain
+    return registered_domain or host
 
 
 def url_from_host(host):
@@ -38,11 +38,45 @@ def url_from_host(host):
     :param host: a host value to be used in the URL
     :returns: a URL to be used during testing
     """
-    if ipv6(host):
+    if ':' in host and ipv6(host):
         host = '['+host+']'
     return 'http://'+host
 
 
+def call_ignoring_errors(function, value):
+    """Call the function for the value, ignoring any errors.
+
+    :param function: a function to be called
+    :param value: an argument for the function
+    """
+    try:
+        function(value)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def query_concurrently(client, hosts):
+    """Query the client for all the hosts at the same time.
+
+    The client caches results of its queries, so calling this function
+    before tests using the hosts makes them reuse the results instead
+    of waiting for the service to respond to each of them separately.
+
+    The hosts are looked up before testing them for membership, so
+    that clients using the same query for both operations query each
+    host only once.
+
+    Errors are ignored, so that they are raised only by the tests
+    repeating the failed queries.
+
+    :param client: a host list client to be queried
+    :param hosts: host values to be used in the queries
+    """
+    for function in client.lookup, client.__contains__:
+        query = partial(call_ignoring_errors, function)
+        list(map_concurrently(query, hosts, len(hosts)))
+
+
 def get_classification(classification, return_codes):
     """Get expected classification for a host listed by a DNSBL service.
 
@@ -55,7 +89,7 @@ def get_classification(classification, return_codes):
     to a set stored in an AddressListItem instance returned by a client
     whose integration with a DNSBL service is being tested
     """
-    return set(v for k, v in list(classification.items()) if k in return_codes)
+    return set(classification[k] for k in return_codes if k in classification)
 
 
 class URLTesterClientTestMixin(object):
@@ -133,6 +167,7 @@ class HostListClientTestMixin(URLTesterClientTestMixin):
 
     @classmethod
     def setUpClass(cls):
+        cls.tested_client.cache_clear()
         cls.listed_url = url_from_host(cls.listed)
         cls.not_listed_url = url_from_host(cls.not_listed)
         cls.urls_with_listed = cls.not_listed_url, cls.listed_url
@@ -145,6 +180,10 @@ class HostListClientTestMixin(URLTesterClientTestMixin):
             cls.tested_client,
             cls.classification
         )
+        query_concurrently(
+            cls.tested_client,
+            (cls.listed, cls.not_listed, cls.not_listed_2)
+        )
 
     def test__contains__for_not_listed(self):
         """Test if False is returned for an unlisted host."""
@@ -10,7 +10,19 @@ from types import GeneratorType
 
 from spam_lists.exceptions import InvalidURLError, InvalidHostError
 from spam_lists.structures import AddressListItem
-from test.compat import MagicMock, patch, lru_cache
+from test.compat import Mock, patch, lru_cache
+
+
+@lru_cache(maxsize=256)
+def get_expected_items(source, classification, values):
+    """Get items expected to be returned for listed values.
+
+    :param source: a source of the items
+    :param classification: a frozenset of classifications of the items
+    :param values: a tuple of listed values
+    :returns: a tuple of instances of AddressListItem
+    """
+    return tuple(AddressListItem(v, source, classification) for v in values)
 
 
 class URLTesterTestBaseMixin(object):
@@ -63,47 +75,51 @@ class URLTesterTestMixin(URLTesterTestBaseMixin):
     of instances of AddressListItem to be returned by
     lookup_matching(urls) method
     :cvar valid_url_input: test arguments, each containing
-    a suffix for a name of a test method to be generated and a list
+    a suffix for a name of a test method to be generated and a tuple
     of URLs to be passed to a tested method.
 
-    Each list of URLs contains a value.
+    Each tuple of URLs contains a value.
     :cvar valid_url_list_input: test arguments, each containing
-    a suffix for a name of a test method to be generated and a list
+    a suffix for a name of a test method to be generated and a tuple
     of URLs to be passed to a tested method
     """
 
     classification = set(['TEST'])
-    valid_url_input = [
-        ('ipv4_url', ['http://55.44.33.21']),
-        ('hostname_url', ['https://abc.com']),
-        ('ipv6_url', ['http://[2001:ddd:ccc:111::33]'])
-    ]
-    valid_url_list_input = [
-        ('no_matching_url', []),
-        ('two_urls', [
+    valid_url_input = (
+        ('ipv4_url', ('http://55.44.33.21',)),
+        ('hostname_url', ('https://abc.com',)),
+        ('ipv6_url', ('http://[2001:ddd:ccc:111::33]',))
+    )
+    valid_url_list_input = (
+        ('no_matching_url', ()),
+        ('two_urls', (
             'http://55.44.33.21',
             'https://abc.com'
-        ])
-    ]+valid_url_input
+        ))
+    ) + valid_url_input
 
     @parameterized.expand([
         ('any_match'),
         ('lookup_matching'),
         ('filter_matching')
     ])
-    @patch('spam_lists.validation.is_valid_url')
+    @patch('spam_lists.validation._get_valid_host')
     def test_query_for_invalid_url_with(
             self,
             function_name,
-            is_valid_url_mock
+            get_valid_host_mock
     ):
         """Test if the method raises InvalidURLError.
 
         :param function_name: name of a method to be tested
-        :param is_valid_url_mock: mock of is_valid_url function
+        :param get_valid_host_mock: mock of a function returning
+        hosts of valid URLs
         """
         invalid_url = 'http://invalid.url.com'
-        is_valid_url_mock.side_effect = lambda u: u != invalid_url
+
+        def get_valid_host(url):
+            return None if url == invalid_url else get_parsed_hostname(url)
+        get_valid_host_mock.side_effect = get_valid_host
         function = getattr(self.tested_instance, function_name)
         with self.assertRaises(InvalidURLError):
             function(self.valid_urls + [invalid_url])
@@ -135,14 +151,27 @@ class URLTesterTestMixin(URLTesterTestBaseMixin):
         """
         self._test_filter_matching_for(matching_urls)
 
+    @classmethod
+    def tearDownClass(cls):
+        get_expected_items.cache_clear()
+        super(URLTesterTestMixin, cls).tearDownClass()
+
     def _get_expected_items(self, values):
-        def get_item(item):
-            return AddressListItem(
-                item,
-                self.tested_instance,
-                self.classification
-            )
-        return [get_item(v) for v in values]
+        return get_expected_items(
+            self.tested_instance,
+            frozenset(self.classification),
+            tuple(values)
+        )
+
+
+@lru_cache(maxsize=4096)
+def get_parsed_hostname(url):
+    """Get a host extracted from a URL.
+
+    :param url: a URL address from which the function extracts a host
+    :returns: the host extracted from the URL
+    """
+    return urlparse(url).hostname
 
 
 def get_hosts(urls):
@@ -151,7 +180,7 @@ def get_hosts(urls):
     :param urls: URL addresses from which the function extracts hosts
     :returns: a list of hosts extracted from the URLs
     """
-    return [urlparse(u).hostname for u in urls]
+    return [get_parsed_hostname(u) for u in urls]
 
 
 class HostListTestMixin(URLTesterTestMixin):
@@ -162,11 +191,11 @@ class HostListTestMixin(URLTesterTestMixin):
     or IP address to be passed to a tested method
     """
 
-    valid_host_input = [
+    valid_host_input = (
         ('ipv4', '255.0.120.1'),
         ('hostname', 'test.pl'),
         ('ipv6', '2001:ddd:ccc:111::33')
-    ]
+    )
 
     def _set_matching_urls(self, urls):
         self._set_matching_hosts(get_hosts(urls))
@@ -176,7 +205,9 @@ class HostListTestMixin(URLTesterTestMixin):
 
     def _get_result_for_invalid_host(self, function):
         unsupported_host = 'unsupported.com'
-        self.host_factory_mock.side_effect = InvalidHostError
+        self.tested_instance._host_factory = Mock(
+            side_effect=InvalidHostError
+        )
         return function(unsupported_host)
 
     def test_contains_for_invalid_host(self):
@@ -262,16 +293,107 @@ class HostListTestMixin(URLTesterTestMixin):
         self.assertIsNone(self.tested_instance.lookup(value))
 
 
-@lru_cache()
+def get_query_name(host):
+    """Get a query name for a host represented by HostStub.
+
+    :param host: a host value
+    :returns: a value returned by derelativize method of a relative
+    domain of a stub representing the host
+    """
+    return 'query.' + host
+
+
+class RelativeDomainStub(object):
+    """A lightweight replacement for a relative domain of a host.
+
+    :ivar query_name: a value returned by the derelativize method
+    """
+
+    __slots__ = ('query_name',)
+
+    def __init__(self, query_name):
+        """Initialize a new instance.
+
+        :param query_name: a value to be returned by derelativize
+        """
+        self.query_name = query_name
+
+    def derelativize(self, *_):
+        """Get the query name, regardless of the origin passed.
+
+        :returns: the query name
+        """
+        return self.query_name
+
+
+class HostStub(object):
+    """A lightweight replacement for an object representing a host.
+
+    Building an instance of this class is much cheaper than building
+    an instance of MagicMock with the same attributes configured.
+    Instances representing the same host value are equal.
+
+    :ivar value: a host value represented by the object
+    :ivar relative_domain: an object representing a relative domain
+    of the host
+    """
+
+    __slots__ = ('value', 'relative_domain')
+
+    def __init__(self, value):
+        """Initialize a new instance.
+
+        :param value: a host value to be represented by the object
+        """
+        self.value = value
+        self.relative_domain = RelativeDomainStub(get_query_name(value))
+
+    def to_unicode(self):
+        """Get the host value.
+
+        :returns: the host value
+        """
+        return self.value
+
+    def __eq__(self, other):
+        """Check if the other object represents the same host.
+
+        :param other: an object to be compared
+        :returns: result of the comparison
+        """
+        if not isinstance(other, HostStub):
+            return NotImplemented
+        return self.value == other.value
+
+    def __ne__(self, other):
+        """Check if the other object represents a different host.
+
+        :param other: an object to be compared
+        :returns: result of the comparison
+        """
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        """Get a hash of the host value."""
+        return hash(self.value)
+
+
+@lru_cache(maxsize=256)
 def host_list_host_factory(host):
-    """Get a mock object representing a host.
+    """Get a stub object representing a host.
+
+    The stubs are cached, so that they are not rebuilt for the same
+    values. Since stubs are compared by value, evicting one does not
+    affect tests. Test classes using this function are expected to
+    clear the cache when they are done.
 
-    :param host: a host value to be represented by the mock
-    :returns: an instance of Mock for an object representing given host
+    :param host: a host value to be represented by the stub
+    :returns: an instance of HostStub for given host
     """
-    host_object = MagicMock()
-    host_object.to_unicode.return_value = host
-    return host_object
+    return HostStub(host)
 
 
 class TestFunctionDoesNotHandleMixin(object):
@@ -3,6 +3,7 @@
 """Tests for classes representing blacklist service clients."""
 from __future__ import unicode_literals
 
+from dns.exception import Timeout
 from dns.resolver import NXDOMAIN
 from future.moves.urllib.parse import urlparse, parse_qs
 from nose_parameterized import parameterized
@@ -10,27 +11,92 @@ from requests.exceptions import HTTPError
 
 from spam_lists.exceptions import UnathorizedAPIKeyError, UnknownCodeError
 from spam_lists.clients import (
-    DNSBL, GoogleSafeBrowsing, HpHosts, BitmaskingDNSBL
+    DNSBL, GoogleSafeBrowsing, HpHosts, BitmaskingDNSBL, map_concurrently,
+    QueryResultCache
 )
-from test.compat import unittest, Mock, patch
+from test.compat import unittest, Mock, NonCallableMock, patch, lru_cache
 from test.unit.common_definitions import (
-    HostListTestMixin, host_list_host_factory, URLTesterTestMixin
+    HostListTestMixin, host_list_host_factory, URLTesterTestMixin,
+    get_query_name
 )
 
 
+class QueryResultCacheTest(unittest.TestCase):
+    """Tests for QueryResultCache class.
+
+    :ivar monotonic_patcher: an object used for patching monotonic
+    function used by the cache
+    :ivar monotonic_mock: a mocked implementation of the function
+    :ivar query_function: a mock of a function performing a query
+    :ivar tested_instance: an instance of tested class
+    """
+
+    def setUp(self):
+        self.monotonic_patcher = patch('spam_lists.clients.monotonic')
+        self.monotonic_mock = self.monotonic_patcher.start()
+        self.addCleanup(self.monotonic_patcher.stop)
+        self.monotonic_mock.return_value = 0
+        self.query_function = Mock()
+        self.tested_instance = QueryResultCache(2, 10)
+
+    def _get_result(self, key):
+        return self.tested_instance.get_result(key, self.query_function)
+
+    def test_result_is_cached(self):
+        """Test if a result is returned without repeating the query."""
+        expected = self._get_result('key')
+        actual = self._get_result('key')
+        self.assertEqual(expected, actual)
+        self.query_function.assert_called_once_with()
+
+    def test_result_expires(self):
+        """Test if a query is repeated after its result expires."""
+        self._get_result('key')
+        self.monotonic_mock.return_value = 10
+        self._get_result('key')
+        self.assertEqual(2, self.query_function.call_count)
+
+    def test_least_recently_used_result_is_discarded(self):
+        """Test if the least recently used result is discarded first."""
+        for key in 'first', 'second', 'first', 'third', 'first':
+            self._get_result(key)
+        self._get_result('second')
+        self.assertEqual(4, self.query_function.call_count)
+
+    def test_clear(self):
+        """Test if a query is repeated after the cache is cleared."""
+        self._get_result('key')
+        self.tested_instance.clear()
+        self._get_result('key')
+        self.assertEqual(2, self.query_function.call_count)
+
+    def test_contains(self):
+        """Test if only unexpired results are reported as cached."""
+        self.assertFalse('key' in self.tested_instance)
+        self._get_result('key')
+        self.assertTrue('key' in self.tested_instance)
+        self.monotonic_mock.return_value = 10
+        self.assertFalse('key' in self.tested_instance)
+
+
 class DNSQuerySideEffects(object):
     """A class providing a side effect for a mock of query function."""
 
     def __init__(self, expected_query_names, last_octet=2):
         """Initialize a new instance.
 
+        The same DNS answer is returned for all expected query names,
+        so it is prepared once, here.
+
         :param expected_query_names: domain names for which the mock is
         expected to return a mock of a DNS answer object
         :param last_octet: a number to be used as last octet of an
         IP address provided by the answer object
         """
-        self.expected_query_names = expected_query_names
-        self.last_octet = last_octet
+        dns_answer_mock = NonCallableMock(spec_set=['to_text'])
+        return_value = '121.0.0.{}'.format(last_octet)
+        dns_answer_mock.to_text.return_value = return_value
+        self.answers = dict.fromkeys(expected_query_names, [dns_answer_mock])
 
     def __call__(self, query_name):
         """Query for a DNS name.
@@ -40,12 +106,10 @@ class DNSQuerySideEffects(object):
         :raises NXDOMAIN: if query_name is not included in
         the preconfigured list
         """
-        if query_name in self.expected_query_names:
-            dns_answer_mock = Mock()
-            return_value = '121.0.0.{}'.format(self.last_octet)
-            dns_answer_mock.to_text.return_value = return_value
-            return [dns_answer_mock]
-        raise NXDOMAIN
+        answers = self.answers.get(query_name)
+        if answers is None:
+            raise NXDOMAIN
+        return answers
 
 
 class DNSBLTestMixin(HostListTestMixin):
@@ -54,21 +118,30 @@ class DNSBLTestMixin(HostListTestMixin):
     :cvar query_domain_str: a string used as a suffix for DNS queries
     to a service
     :cvar host_with_unknown_code: a host value to be used during tests
-    :ivar host_factory_mock: a mocked implementation of host factory
-    used by tested instance. Uses host_list_host_factory as its implementation
     :ivar dnsbl_factory: constructor of instance of tested class
     :ivar tested_instance: an instance of tested class
-    :ivar dns_query_patcher: an object used for patching query function
+    :cvar dns_query_patcher: an object used for patching query function
      used by DNSBL instance
-    :ivar dns_query_mock: a mocked implementation of the query function
+    :cvar dns_query_mock: a mocked implementation of the query function
+
+    The tested instance uses host_list_host_factory as its host factory.
     """
 
     query_domain_str = 'test.query.domain'
     host_with_unknown_code = 'hostwithunknowncode.com'
 
+    @classmethod
+    def setUpClass(cls):
+        cls.dns_query_patcher = patch('spam_lists.clients.query')
+        cls.dns_query_mock = cls.dns_query_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.dns_query_patcher.stop()
+        host_list_host_factory.cache_clear()
+        super(DNSBLTestMixin, cls).tearDownClass()
+
     def setUp(self):
-        self.host_factory_mock = Mock()
-        self.host_factory_mock.side_effect = host_list_host_factory
         classification_map = {}
         for i, k in enumerate(self.classification, 1):
             classification_map[2**i] = k
@@ -76,20 +149,16 @@ class DNSBLTestMixin(HostListTestMixin):
             'test_service',
             self.query_domain_str,
             classification_map,
-            self.host_factory_mock
+            host_list_host_factory
         )
-        self.dns_query_patcher = patch('spam_lists.clients.query')
-        self.dns_query_mock = self.dns_query_patcher.start()
-        self.dns_query_mock.side_effect = DNSQuerySideEffects([])
+        self.dns_query_mock.reset_mock()
+        self.dns_query_mock.side_effect = NXDOMAIN
 
-    def tearDown(self):
-        self.dns_query_patcher.stop()
-
-    def _set_matching_hosts(self, hosts):
-        host_objects = [self.host_factory_mock(h) for h in hosts]
-        query_names = [h.relative_domain.derelativize()
-                       for h in host_objects]
-        self.dns_query_mock.side_effect.expected_query_names = query_names
+    def _set_matching_hosts(self, hosts, last_octet=2):
+        self.dns_query_mock.side_effect = DNSQuerySideEffects(
+            map(get_query_name, hosts),
+            last_octet
+        )
 
     @parameterized.expand([
         ('lookup', host_with_unknown_code),
@@ -110,8 +179,7 @@ class DNSBLTestMixin(HostListTestMixin):
         :param function_name: a name of a method to be tested
         :param tested_value: a host value to be used for the test
         """
-        self._set_matching_hosts([self.host_with_unknown_code])
-        self.dns_query_mock.side_effect.last_octet = 14
+        self._set_matching_hosts([self.host_with_unknown_code], 14)
 
         def function(hosts):
             func = getattr(self.tested_instance, function_name)
@@ -119,6 +187,84 @@ class DNSBLTestMixin(HostListTestMixin):
 
         self.assertRaises(UnknownCodeError, function, tested_value)
 
+    def test_query_results_are_cached(self):
+        """Test if the service is queried once for repeated lookups."""
+        host = 'listed.com'
+        self._set_matching_hosts([host])
+        self.tested_instance.lookup(host)
+        self.assertTrue(host in self.tested_instance)
+        self.assertEqual(1, self.dns_query_mock.call_count)
+
+    @patch('spam_lists.clients.map_concurrently')
+    def test_sequential_queries_for_single_uncached(
+            self,
+            map_concurrently_mock
+    ):
+        """Test if a single uncached host is queried without threads.
+
+        :param map_concurrently_mock: a mock of map_concurrently
+        function
+        """
+        cached_url = 'http://cached.com'
+        self.tested_instance.any_match([cached_url])
+        urls = [cached_url, 'http://uncached.com']
+        self.assertFalse(self.tested_instance.any_match(urls))
+        map_concurrently_mock.assert_not_called()
+        self.assertEqual(2, self.dns_query_mock.call_count)
+
+    @patch('spam_lists.clients.map_concurrently')
+    def test_concurrent_queries_for_uncached(self, map_concurrently_mock):
+        """Test if only uncached hosts are queried concurrently.
+
+        :param map_concurrently_mock: a mock of map_concurrently
+        function
+        """
+        cached_url = 'http://cached.com'
+        self.tested_instance.any_match([cached_url])
+        hosts = ['first.com', 'second.com']
+        urls = [cached_url] + ['http://' + h for h in hosts]
+        self.tested_instance.any_match(urls)
+        map_concurrently_mock.assert_called_once_with(
+            self.tested_instance._prefetch,
+            [get_query_name(h) for h in hosts],
+            2
+        )
+
+    def test_any_match_stops_at_first_match(self):
+        """Test if hosts in batches after a listed one are not queried."""
+        self.tested_instance.max_concurrent_queries = 2
+        self._set_matching_hosts(['listed.com'])
+        urls = ['http://listed.com', 'http://first.com', 'http://second.com',
+                'http://third.com']
+        self.assertTrue(self.tested_instance.any_match(urls))
+        self.assertEqual(2, self.dns_query_mock.call_count)
+
+    def _set_failing_host(self, failing_host):
+        """Set a host for which the DNS query raises an error.
+
+        :param failing_host: a host value
+        """
+        answers = DNSQuerySideEffects([get_query_name('listed.com')])
+        failing_query_name = get_query_name(failing_host)
+
+        def query(query_name):
+            if query_name == failing_query_name:
+                raise Timeout
+            return answers(query_name)
+        self.dns_query_mock.side_effect = query
+
+    def test_any_match_ignores_error_for_unneeded_query(self):
+        """Test if an error for a host after a listed one is ignored."""
+        self._set_failing_host('failing.com')
+        urls = ['http://listed.com', 'http://failing.com']
+        self.assertTrue(self.tested_instance.any_match(urls))
+
+    def test_any_match_raises_error_for_needed_query(self):
+        """Test if an error for a host before a listed one is raised."""
+        self._set_failing_host('failing.com')
+        urls = ['http://failing.com', 'http://listed.com']
+        self.assertRaises(Timeout, self.tested_instance.any_match, urls)
+
 
 class DNSBLTest(DNSBLTestMixin, unittest.TestCase):
     """Tests for DNSBL class."""
@@ -134,6 +280,46 @@ class BitmaskingDNSBLTest(DNSBLTestMixin, unittest.TestCase):
     dnsbl_factory = BitmaskingDNSBL
 
 
+class MapConcurrentlyTest(unittest.TestCase):
+    """Tests for map_concurrently function."""
+
+    def test_results_are_in_order(self):
+        """Test if the results are yielded in the order of arguments."""
+        values = list(range(50))
+        actual = list(map_concurrently(lambda v: v * 2, values, 8))
+        self.assertEqual([v * 2 for v in values], actual)
+
+    def test_error_is_not_handled(self):
+        """Test if an error raised by the function is propagated."""
+        function = Mock(side_effect=UnknownCodeError)
+        with self.assertRaises(UnknownCodeError):
+            list(map_concurrently(function, ['a', 'b'], 2))
+
+
+@lru_cache(maxsize=4096)
+def get_queried_host(url):
+    """Get a host value from a URL of a request to hpHosts.
+
+    :param url: a request address
+    :returns: a value of the 's' query parameter of the request
+    """
+    query_data = parse_qs(urlparse(url).query)
+    return query_data['s'][0]
+
+
+def get_response_mock(**attributes):
+    """Get a mock representing a response to a HTTP request.
+
+    :param attributes: values of attributes of the response
+    :returns: a non-callable mock having only the attributes of
+    a response object used by the clients
+    """
+    return NonCallableMock(
+        spec_set=['text', 'status_code', 'raise_for_status'],
+        **attributes
+    )
+
+
 def create_hp_hosts_get(classification, listed_hosts):
     """Get a function to replace the get function used by HpHosts.
 
@@ -142,7 +328,11 @@ def create_hp_hosts_get(classification, listed_hosts):
     :returns: a function providing side effects of Mock instance
     for the get function
     """
-    class_str = ','.join(classification)
+    listed_response = get_response_mock(
+        text='Listed,{}'.format(','.join(classification))
+    )
+    not_listed_response = get_response_mock(text='Not Listed')
+    listed_hosts = frozenset(listed_hosts)
 
     def hp_hosts_get(url):
         """Get mock representing a response for a GET request.
@@ -151,15 +341,9 @@ def create_hp_hosts_get(classification, listed_hosts):
         :returns: a Mock instance representing response object expected
         by HpHosts
         """
-        query_string = urlparse(url).query
-        query_data = parse_qs(query_string)
-        content = 'Not Listed'
-        host = query_data['s'][0]
-        if host in listed_hosts:
-            content = 'Listed,{}'.format(class_str)
-        response = Mock()
-        response.text = content
-        return response
+        if get_queried_host(url) in listed_hosts:
+            return listed_response
+        return not_listed_response
     return hp_hosts_get
 
 
@@ -170,36 +354,39 @@ class HpHostsTest(HostListTestMixin, unittest.TestCase):
 
     :ivar listed_hosts: a list of host values assumed to be listed
     for tests
-    :ivar get_patcher: an object used for patching get function used by
+    :cvar get_patcher: an object used for patching get function used by
     a HpHosts instance
-    :ivar get_mock: a mocked implementation of the get function. Uses
-    a function returned by create_hp_hosts_get for given classification
-    and list of hosts
-    :ivar host_factory_mock: a mocked implementation of host factory
-    used by tested instance. Uses host_list_host_factory as its
-    implementation.
+    :cvar get_mock: a mocked implementation of the get function. Unless
+    a test sets up matching hosts, it returns a response for a host
+    that is not listed. Otherwise, it uses a function returned by
+    create_hp_hosts_get for given classification and list of hosts
+
+    The tested instance is shared by all tests of the class. It uses
+    host_list_host_factory as its host factory, and its host factory
+    and cached results are reset before each test.
     """
 
     # pylint: disable=too-many-public-methods
     @classmethod
     def setUpClass(cls):
         cls.tested_instance = HpHosts('spam_lists_test_suite')
+        cls.tested_instance._host_factory = host_list_host_factory
+        cls.get_patcher = patch('spam_lists.clients.get')
+        cls.get_mock = cls.get_patcher.start()
+        cls.get_mock.return_value = get_response_mock(text='Not Listed')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.get_patcher.stop()
+        host_list_host_factory.cache_clear()
+        super(HpHostsTest, cls).tearDownClass()
 
     def setUp(self):
         self.listed_hosts = []
-        self.get_patcher = patch('spam_lists.clients.get')
-        self.get_mock = self.get_patcher.start()
-        self.get_mock.side_effect = create_hp_hosts_get(
-            self.classification,
-            []
-        )
-        self.host_factory_mock = Mock()
-        self.tested_instance = HpHosts('spam_lists_test_suite')
-        self.tested_instance._host_factory = self.host_factory_mock
-        self.host_factory_mock.side_effect = host_list_host_factory
-
-    def tearDown(self):
-        self.get_patcher.stop()
+        self.get_mock.reset_mock()
+        self.get_mock.side_effect = None
+        self.tested_instance._host_factory = host_list_host_factory
+        self.tested_instance.cache_clear()
 
     def _set_matching_hosts(self, hosts):
         side_effect = create_hp_hosts_get(
@@ -208,35 +395,49 @@ class HpHostsTest(HostListTestMixin, unittest.TestCase):
         )
         self.get_mock.side_effect = side_effect
 
+    def test_query_results_are_cached(self):
+        """Test if the service is queried once per request URL."""
+        host = 'listed.com'
+        self._set_matching_hosts([host])
+        for _ in range(2):
+            self.tested_instance.lookup(host)
+            self.assertTrue(host in self.tested_instance)
+        self.assertEqual(2, self.get_mock.call_count)
+        requested_urls = {c[0][0] for c in self.get_mock.call_args_list}
+        self.assertEqual(2, len(requested_urls))
+
 
-def create_gsb_post(expected_401, spam_urls, classification):
+def create_gsb_post(spam_urls, classification):
     """Get mock for post function used by GoogleSafeBrowsing.
 
-    :param expected_401: if True, the code of response mock returned
-    by the returned function will be 401
     :param spam_urls: a list of URLs to be recognized as spam
     :param classification: a classification used for spam URLs
     :returns: mocked implementation of post function
     """
+    spam_urls = frozenset(spam_urls)
+    spam_class = ','.join(classification)
+    code = 200 if spam_urls else 204
+    responses = {}
+
     def post(_, body):
         """Get mock of a response to a POST query to GSB Lookup API.
 
         :param body: a request body
         :returns: a Mock instance representing the response. Properties
         of the object depend on external values provided by the creator
-        of the method: expected_401, spam_urls and classification
+        of the method: spam_urls and classification. The same
+        instance is returned for repeated requests with the same body
         """
-        response = Mock()
-        if expected_401:
-            response.status_code = 401
-            response.raise_for_status.side_effect = HTTPError
-        else:
-            urls = body.splitlines()[1:]
-            classes = ['ok' if u not in spam_urls else
-                       ','.join(classification) for u in urls]
-            response.text = '\n'.join(classes)
-            code = 200 if spam_urls else 204
-            response.status_code = code
+        response = responses.get(body)
+        if response is None:
+            urls = body.partition('\n')[2].split('\n')
+            classes = ['ok' if u not in spam_urls else spam_class
+                       for u in urls]
+            response = get_response_mock(
+                text='\n'.join(classes),
+                status_code=code
+            )
+            responses[body] = response
         return response
     return post
 
@@ -252,11 +453,16 @@ class GoogleSafeBrowsingTest(URLTesterTestMixin, unittest.TestCase):
 
     :cvar tested_instance: an instance of tested class
 
-    :ivar post_patcher: an object used for patching post function used
+    :cvar post_patcher: an object used for patching post function used
     by GoogleSafeBrowsing instance
-    :ivar mocked_post: a mocked implementation of the post function
-    for the tested instance. Uses a function returned by
-    create_gsb_post function as its implementation.
+    :cvar mocked_post: a mocked implementation of the post function
+    for the tested instance. Unless a test sets up matching URLs,
+    it returns no_match_response. Otherwise, it uses a function
+    returned by create_gsb_post function as its implementation.
+    :cvar no_match_response: a mock of a response reporting no
+    matching URLs
+    :cvar unauthorized_response: a mock of a response to a request
+    with an unathorized API key
     """
 
     # pylint: disable=too-many-public-methods
@@ -270,24 +476,27 @@ class GoogleSafeBrowsingTest(URLTesterTestMixin, unittest.TestCase):
             '0.1',
             'test_key'
         )
+        cls.post_patcher = patch('spam_lists.clients.post')
+        cls.mocked_post = cls.post_patcher.start()
+        cls.no_match_response = get_response_mock(status_code=204)
+        cls.unauthorized_response = get_response_mock(status_code=401)
+        cls.unauthorized_response.raise_for_status.side_effect = HTTPError
 
-    def _set_up_post_mock(self, spam_urls, error_401_expected=False):
-        side_efect = create_gsb_post(
-            error_401_expected,
-            spam_urls,
-            self.classification
-        )
-        self.mocked_post.side_effect = side_efect
+    @classmethod
+    def tearDownClass(cls):
+        cls.post_patcher.stop()
+        super(GoogleSafeBrowsingTest, cls).tearDownClass()
 
     def setUp(self):
-        self.post_patcher = patch('spam_lists.clients.post')
-        self.mocked_post = self.post_patcher.start()
-
-    def tearDown(self):
-        self.post_patcher.stop()
+        self.mocked_post.reset_mock()
+        self.mocked_post.side_effect = None
+        self.mocked_post.return_value = self.no_match_response
 
     def _set_matching_urls(self, urls):
-        self._set_up_post_mock(urls)
+        self.mocked_post.side_effect = create_gsb_post(
+            urls,
+            self.classification
+        )
 
     @parameterized.expand([
         ('any_match'),
@@ -309,7 +518,7 @@ class GoogleSafeBrowsingTest(URLTesterTestMixin, unittest.TestCase):
             :param urls: URL values to be used during the test
             """
             return list(tested_function(urls))
-        self._set_up_post_mock([], error_401_expected=True)
+        self.mocked_post.return_value = self.unauthorized_response
         self.assertRaises(
             UnathorizedAPIKeyError,
             called_function,
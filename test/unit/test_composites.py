@@ -16,7 +16,9 @@ from spam_lists.structures import AddressListItem
 from spam_lists.composites import (
     RedirectURLResolver, URLTesterChain, CachedIterable, GeneralizedURLTester
 )
-from test.compat import unittest, Mock, patch, lru_cache, MagicMock
+from test.compat import (
+    unittest, Mock, patch, lru_cache, MagicMock, NonCallableMock
+)
 from test.unit.common_definitions import (
     URLTesterTestBaseMixin, TestFunctionDoesNotHandleMixin
 )
@@ -28,7 +30,7 @@ def get_response_mock(url):
     :param url: response URL
     :returns: an instance of mock representing a response
     """
-    response = Mock()
+    response = NonCallableMock(spec_set=['url', 'headers', 'request'])
     response.url = url
     return response
 
@@ -101,8 +103,8 @@ class RedirectURLResolverTest(unittest.TestCase):
     ResolveRedirectsSideEffects used as a replacement implementation
     for requests.Session.resolve_redirects
     :ivar resolver: an instance of RedirectURLResolver to be tested
-    :ivar patcher: an object used to patch is_valid_url function
-    :ivar is_valid_url_mock: a mocked implementation of
+    :cvar patcher: an object used to patch is_valid_url function
+    :cvar is_valid_url_mock: a mocked implementation of
     the is_valid_url function
     """
 
@@ -116,6 +118,15 @@ class RedirectURLResolverTest(unittest.TestCase):
     ]
     no_redirect_url_chain = ['http://noredirects.com']
 
+    @classmethod
+    def setUpClass(cls):
+        cls.patcher = patch('spam_lists.composites.is_valid_url')
+        cls.is_valid_url_mock = cls.patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher.stop()
+
     def setUp(self):
         session_mock = Mock()
         self.head_mock = session_mock.head
@@ -124,11 +135,9 @@ class RedirectURLResolverTest(unittest.TestCase):
         self.redirect_results = ResolveRedirectsSideEffects()
         self.resolve_redirects_mock.side_effect = self.redirect_results
         self.resolver = RedirectURLResolver(session_mock)
-        self.patcher = patch('spam_lists.composites.is_valid_url')
-        self.is_valid_url_mock = self.patcher.start()
-
-    def tearDown(self):
-        self.patcher.stop()
+        self.is_valid_url_mock.reset_mock()
+        self.is_valid_url_mock.side_effect = None
+        self.is_valid_url_mock.return_value = True
 
     def test_get_locations_for_invalid(self):
         """Test if InvalidURLError is raised for invalid initial URL."""
@@ -399,8 +408,8 @@ class URLTesterChainTest(
         )
 
     def _get_expected_items_for_urls(self, urls):
-        return [self._get_item(u, i) for u, ids
-                in list(urls.items()) for i in ids]
+        get_item = self._get_item
+        return [get_item(u, i) for u, ids in list(urls.items()) for i in ids]
 
     def _set_matching_urls(self, urls):
         """Set URLs expected to be matched during a test.
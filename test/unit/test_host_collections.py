@@ -5,13 +5,12 @@ from __future__ import unicode_literals
 
 from dns import name
 from ipaddress import ip_address
-from nose_parameterized import parameterized
 
 from spam_lists.exceptions import InvalidHostError
 from spam_lists.host_collections import HostCollection, SortedHostCollection
 from test.compat import unittest, Mock
 from test.unit.common_definitions import (
-    TestFunctionDoesNotHandleMixin, host_list_host_factory, HostListTestMixin
+    TestFunctionDoesNotHandleMixin, HostListTestMixin, HostStub
 )
 
 
@@ -36,48 +35,45 @@ def has_to_unicode(value):
     return hasattr(value, 'to_unicode')
 
 
-def host_collection_host_factory(host):
-    """Get a mock of a host object stored in a collection.
+class CollectionHostStub(HostStub):
+    """A lightweight replacement for a host object stored in a collection.
 
-    :param host: a host value to be represented by the mock
-    :returns: an instance of Mock representing a host object stored
-    in a host collection
+    A host matches other host object if the value of the latter is
+    a part of the value of the former. The same test is used to check
+    if a host is a subdomain of the other.
     """
-    host_object = host_list_host_factory(host)
-    _str = host_object.to_unicode()
 
-    def test(other):
+    __slots__ = ()
+
+    def is_match(self, other):
         """Test if the other and the host object match each other.
 
         :param other: an object to be compared
         :returns: result of the test
         """
         return (has_to_unicode(other) and
-                other.to_unicode() in _str)
-    host_object.is_match.side_effect = test
-    host_object.is_subdomain.side_effect = test
+                other.to_unicode() in self.value)
+
+    is_subdomain = is_match
 
-    def less_than(other):
+    def __lt__(self, other):
         """Check if the host object key is less than the other.
 
-        This function is an implementation of __lt__ expected from host
-        objects by bisect_right function.
+        This method is expected from host objects by bisect_right
+        function.
 
         :param other: a value to be compared
         :returns: result of the comparison
         """
-        host_object_key = get_sorting_key(_str)
+        host_object_key = get_sorting_key(self.value)
         other_value = other.to_unicode() if has_to_unicode(other) else other
         other_key = get_sorting_key(other_value)
         try:
             result = host_object_key < other_key
         except TypeError:
-            result = _str < other_value
+            result = self.value < other_value
         return result
 
-    host_object.__lt__.side_effect = less_than
-    return host_object
-
 
 class HostCollectionBaseTest(
         HostListTestMixin,
@@ -85,9 +81,8 @@ class HostCollectionBaseTest(
 ):
     """Tests for subclasses or BaseHostCollection.
 
-    :ivar host_factory_mock: a mocked implementation of host factory
-    used by tested instance. Uses host_collection_host_factory
-    as its implementation.
+    The tested instance uses CollectionHostStub as its host factory.
+
     :ivar tested_instance: an instance of tested class
     """
 
@@ -96,12 +91,10 @@ class HostCollectionBaseTest(
     valid_urls = ['http://test.com', 'http://127.33.22.11']
 
     def setUp(self):
-        self.host_factory_mock = Mock()
-        self.host_factory_mock.side_effect = host_collection_host_factory
         self.tested_instance = self.constructor(
             'test_host_collection',
             self.classification,
-            host_factory=self.host_factory_mock
+            host_factory=CollectionHostStub
         )
 
     def test_add_invalid_host(self):
@@ -110,22 +103,26 @@ class HostCollectionBaseTest(
         An invalid host is defined as a value that doesn't match a type
         of host value accepted by a collection.
         """
+        host_factory_mock = Mock()
+        self.tested_instance._host_factory = host_factory_mock
         function = self.tested_instance.add
         self._test_function_does_not_handle(
             InvalidHostError,
-            self.host_factory_mock,
+            host_factory_mock,
             function,
             'invalidhost.com'
         )
 
-    @parameterized.expand(HostListTestMixin.valid_host_input)
-    def test_add_for_valid(self, _, value):
-        """Test the method for a valid host value.
+    def test_add_for_valid(self):
+        """Test the method for valid host values.
 
-        :param value: a host value to be added
+        Each of the values is added to an empty collection.
         """
-        self.tested_instance.add(value)
-        self.assertTrue(value in self.tested_instance.hosts)
+        for _, value in self.valid_host_input:
+            with self.subTest(value=value):
+                self._set_matching_hosts([])
+                self.tested_instance.add(value)
+                self.assertTrue(value in self.tested_instance.hosts)
 
     def test_add_for_subdomain(self):
         """Test the method for a subdomain of a listed domain.
@@ -182,7 +179,7 @@ class SortedHostCollectionTest(HostCollectionBaseTest, unittest.TestCase):
 
     def _set_matching_hosts(self, hosts):
         self.tested_instance.hosts = list(hosts)
-        self.tested_instance.hosts.sort(key=self.host_factory_mock)
+        self.tested_instance.hosts.sort(key=CollectionHostStub)
 
 
 if __name__ == "__main__":
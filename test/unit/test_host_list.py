@@ -3,7 +3,7 @@
 from __future__ import unicode_literals
 
 from spam_lists.host_list import HostList
-from test.compat import unittest, Mock, patch
+from test.compat import unittest, patch
 from test.unit.common_definitions import (
     HostListTestMixin, host_list_host_factory
 )
@@ -16,51 +16,68 @@ class HostListTest(HostListTestMixin, unittest.TestCase):
     These methods are ought to be implemented by its subclasses. Here,
     we mock these methods so that HostList can be tested.
 
-    :ivar listed_hosts: a list of all host values assumed to be listed for
+    :ivar listed_hosts: a set of all host values assumed to be listed for
     a given test
-    :ivar host_factory_mock: a mocked implementation of host factory
-    used by tested instance. Uses host_list_host_factory as its implementation
+    The tested instance uses host_list_host_factory as its host factory.
+
     :ivar tested_instance: an instance of tested class
-    :ivar _contains_patcher: a patcher for HostList._contains method
-    :ivar _contains_mock: a mock for HostList._contains method.
-    :ivar host_data_getter_patcher: a patcher for
+    :cvar _contains_patcher: a patcher for HostList._contains method
+    :cvar _contains_mock: a mock for HostList._contains method.
+    :cvar host_data_getter_patcher: a patcher for
     HostList._get_match_and_classification method
-    :ivar host_data_getter_mock: a mock for
+    :cvar host_data_getter_mock: a mock for
     HostList._get_match_and_classification method. Uses
     host_list_host_factory as its implementation.
+
+    The patchers are started once for all tests of the class, and
+    the mocks are reset before each test. Unless a test sets up
+    matching hosts, the mocks return values for a host that
+    is not listed.
     """
 
     # pylint: disable=too-many-public-methods
 
-    def setUp(self):
-        self.listed_hosts = []
-        self.host_factory_mock = Mock()
-        self.host_factory_mock.side_effect = host_list_host_factory
-        self.tested_instance = HostList(self.host_factory_mock)
-        self._contains_patcher = patch(
+    @classmethod
+    def setUpClass(cls):
+        cls._contains_patcher = patch(
             'spam_lists.host_list.HostList._contains'
         )
-        self._contains_mock = self._contains_patcher.start()
-        self._contains_mock.side_effect = lambda h: h in self.listed_hosts
+        cls._contains_mock = cls._contains_patcher.start()
         host_data_getter_name = (
             'spam_lists.host_list.HostList._get_match_and_classification'
         )
-        self.host_data_getter_patcher = patch(host_data_getter_name)
-        self.host_data_getter_mock = self.host_data_getter_patcher.start()
+        cls.host_data_getter_patcher = patch(host_data_getter_name)
+        cls.host_data_getter_mock = cls.host_data_getter_patcher.start()
 
-        def _get_match_and_classification(host):
-            if host in self.listed_hosts:
-                return host, self.classification
-            return None, None
-        self.host_data_getter_mock.side_effect = _get_match_and_classification
+    @classmethod
+    def tearDownClass(cls):
+        cls._contains_patcher.stop()
+        cls.host_data_getter_patcher.stop()
+        host_list_host_factory.cache_clear()
+        super(HostListTest, cls).tearDownClass()
 
-    def tearDown(self):
-        self._contains_patcher.stop()
-        self.host_data_getter_patcher.stop()
+    def setUp(self):
+        self.listed_hosts = frozenset()
+        self.tested_instance = HostList(host_list_host_factory)
+        self._contains_mock.reset_mock()
+        self._contains_mock.side_effect = None
+        self._contains_mock.return_value = False
+        self.host_data_getter_mock.reset_mock()
+        self.host_data_getter_mock.side_effect = None
+        self.host_data_getter_mock.return_value = (None, None)
 
     def _set_matching_hosts(self, matching_hosts):
-        self.listed_hosts = [self.host_factory_mock(mh)
-                             for mh in matching_hosts]
+        listed_hosts = frozenset(host_list_host_factory(mh)
+                                 for mh in matching_hosts)
+        classification = self.classification
+        self.listed_hosts = listed_hosts
+        self._contains_mock.side_effect = lambda h: h in listed_hosts
+
+        def _get_match_and_classification(host):
+            if host in listed_hosts:
+                return host, classification
+            return None, None
+        self.host_data_getter_mock.side_effect = _get_match_and_classification
 
 
 if __name__ == "__main__":
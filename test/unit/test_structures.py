@@ -156,17 +156,15 @@ class IPAddressTestMixin(BaseHostTest):
             Mock()
         )
         self.value_constructor_mock = self.value_constructor_patcher.start()
+        self.addCleanup(self.value_constructor_patcher.stop)
 
         self.name_from_ip_patcher = patch('spam_lists.structures.name_from_ip')
         self.name_from_ip_mock = self.name_from_ip_patcher.start()
+        self.addCleanup(self.name_from_ip_patcher.stop)
 
         self.tested_instance = self.class_to_test(Mock())
         super(IPAddressTestMixin, self).setUp()
 
-    def tearDown(self):
-        self.value_constructor_patcher.stop()
-        self.name_from_ip_patcher.stop()
-
     def test_constructor_for_invalid_argument(self):
         """Test if an error is raised for an invalid argument."""
         self.value_constructor_mock.side_effect = ValueError